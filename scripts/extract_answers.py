@@ -1,13 +1,50 @@
 #!/usr/bin/env python3
+import argparse
+import glob
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+def _bounds(value):
+    # 'x'/'y' are either a single coordinate or an inclusive 'start-end' range
+    start, _, end = value.partition('-')
+    return int(start), int(end or start)
+
+def flatten_letters(grid, width):
+    # Slicing relies on exactly one character per cell and equal-length rows;
+    # anything else would shift every later answer, so reject it outright
+    letters = []
+    for y, row in enumerate(grid, 1):
+        if len(row) != width:
+            raise ValueError(f"Grid row {y} has {len(row)} cells, expected {width}")
+        for x, cell in enumerate(row, 1):
+            letter = cell.get('Letter') or ''
+            if not letter and cell.get('Blank') == 'blank':
+                # Blank cells keep a placeholder so offsets stay aligned
+                letter = ' '
+            if len(letter) != 1:
+                raise ValueError(f"Grid cell ({x}, {y}) has letter {letter!r}, expected one character")
+            letters.append(letter)
+    return ''.join(letters)
+
+def word_slice(word_info, width):
+    x_start, x_end = _bounds(word_info['x'])
+    y_start, y_end = _bounds(word_info['y'])
+    start = (y_start-1) * width + (x_start-1)
+    end = (y_end-1) * width + (x_end-1)
+    # Across words are contiguous; down words step a whole row at a time
+    step = 1 if y_start == y_end else width
+    return slice(start, end+1, step)
 
 def extract_answers(json_file):
     with open(json_file, 'r') as f:
         data = json.load(f)
     
     grid = data['data']['grid']
-    words = {w['id']: w for w in data['data']['copy']['words']}
+    width = len(grid[0]) if grid else 0
+    # Each word resolved once to its slice of the flattened letter grid
+    spans = {w['id']: word_slice(w, width) for w in data['data']['copy']['words']}
     clues = []
     
     # Collect all clues
@@ -21,36 +58,13 @@ def extract_answers(json_file):
                 'length': clue['length']
             })
     
-    # Function to get word from positions
-    def get_word(word_info):
-        x = word_info['x']
-        y = word_info['y']
-        
-        letters = []
-        if '-' in x:
-            # Across
-            x_start, x_end = map(int, x.split('-'))
-            y_pos = int(y)
-            for col in range(x_start, x_end + 1):
-                letter = grid[y_pos-1][col-1]['Letter']
-                letters.append(letter)
-        elif '-' in y:
-            # Down
-            x_pos = int(x)
-            y_start, y_end = map(int, y.split('-'))
-            for row in range(y_start, y_end + 1):
-                letter = grid[row-1][x_pos-1]['Letter']
-                letters.append(letter)
-        else:
-            # Single cell, shouldn't happen
-            letters.append(grid[int(y)-1][int(x)-1]['Letter'])
-        
-        return ''.join(letters)
+    # Letters flattened row-major into one string, built once so each answer
+    # is a single (strided) slice
+    letters = flatten_letters(grid, width)
     
     # Add answers to clues
     for clue in clues:
-        word_info = words[clue['word_id']]
-        clue['answer'] = get_word(word_info)
+        clue['answer'] = letters[spans[clue['word_id']]]
     
     return {
         'title': data['data']['copy']['title'],
@@ -59,9 +73,33 @@ def extract_answers(json_file):
     }
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: python extract_answers.py <json_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Extract clues and answers from crossword JSON. A single plain path prints "
+                    "its game data; several paths or any glob pattern print an object of game "
+                    "data keyed by input path."
+    )
+    parser.add_argument('json_files', nargs='+', help="crossword JSON files or glob patterns")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    
+    # The output shape follows how the script was called, not how many files a
+    # pattern happened to match. An existing file is always a plain path, even
+    # if its name contains glob characters like '[1]'.
+    is_pattern = [not os.path.exists(arg) and glob.escape(arg) != arg for arg in args.json_files]
+    keyed = len(args.json_files) > 1 or any(is_pattern)
+    
+    # Expand patterns the shell left quoted; plain paths pass through as-is.
+    # Duplicates are dropped (keeping first-seen order) so each file runs once.
+    expanded = [sorted(glob.glob(arg)) if pattern else [arg] for arg, pattern in zip(args.json_files, is_pattern)]
+    unmatched = [arg for arg, matches in zip(args.json_files, expanded) if not matches]
+    if unmatched:
+        sys.exit("No files match: " + ", ".join(unmatched))
+    paths = list(dict.fromkeys(p for matches in expanded for p in matches))
     
-    result = extract_answers(sys.argv[1])
+    if not keyed:
+        result = extract_answers(paths[0])
+    else:
+        # Puzzles are independent, so spread them across processes
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            result = dict(zip(paths, ex.map(extract_answers, paths)))
     print(json.dumps(result, indent=2))
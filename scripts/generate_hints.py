@@ -8,37 +8,96 @@ Inputs:
 Outputs:
 - hints.json: { "<word_id>": [hint1, hint2, hint3], ... }
 - explanations.json: { "<word_id>": { "steps": [..], "device": str, "highlights": [ {"role": str, "text": str} ] } }
-- hints_cache.json: persistent cache of API results keyed by (model+prompt_version+clue+answer)
+- hints_cache.db: persistent SQLite cache of API results keyed by (model+prompt_version+clue+answer)
 
 Behavior:
-- Up to 10 concurrent API calls
+- Up to 10 concurrent API calls, each worker thread reusing one keep-alive connection
+  (routed through HTTPS_PROXY/HTTP_PROXY unless NO_PROXY matches, as urllib would)
+- Uncached clues batched HINTS_BATCH_SIZE (default 5) per request; items failing validation fall back to one clue per request
+- Fixed system prompts plus a per-prompt prompt_cache_key (HINTS_PROMPT_CACHE_KEY) for server-side prefix caching
 - Single-aspect hints: each of 3 hints labeled (Indicator/Fodder/Definition/Device/Structure/Surface/Grammar/Link/Position)
 - Full explanation JSON with steps and highlight tokens
 - Validation to ensure proper JSON and no answer leakage
 - Skips network if OPENAI_API_KEY is missing; produces empty hints/explanations files
+- Cached entries that have hints but no explanation (e.g. from an older prompt version)
+  are left without one unless HINTS_BACKFILL_EXPL=1 or --backfill is given; they stay
+  that way in the cache until a backfill run fills them in
 """
+import base64
 import concurrent.futures
+import email.utils
 import hashlib
+import http.client
 import json
 import os
+import random
+import re
+import sqlite3
 import sys
+import threading
 import time
+import urllib.parse
 import urllib.request
-import urllib.error
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used without it
+    orjson = None
 
 
 OPENAI_API_URL = os.environ.get("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions")
 # The requested model name can be overridden; default to a widely available model
 MODEL = os.environ.get("HINTS_MODEL", os.environ.get("OPENAI_MODEL", "gpt-4o-mini"))
 MAX_WORKERS = int(os.environ.get("HINTS_CONCURRENCY", "10"))
-CACHE_FILE = os.environ.get("HINTS_CACHE_FILE", "hints_cache.json")
+CACHE_FILE = os.environ.get("HINTS_CACHE_FILE", "hints_cache.db")
 PROMPT_VERSION = os.environ.get("HINTS_PROMPT_VERSION", "v4-2025-08-31")
+# Routing key for OpenAI prompt caching, suffixed per system prompt so calls sharing
+# a prefix land together; set empty for endpoints that reject the field
+PROMPT_CACHE_KEY = os.environ.get("HINTS_PROMPT_CACHE_KEY", "cryptic-hints")
+# Request explanations for cached entries that only have hints (off by default; see --backfill)
+BACKFILL_EXPL = os.environ.get("HINTS_BACKFILL_EXPL", "0") == "1"
+# Uncached clues are sent this many per request; 1 disables batching
+BATCH_SIZE = max(1, int(os.environ.get("HINTS_BATCH_SIZE", "5")))
+
+# One keep-alive connection per worker thread, so the TCP/TLS handshake is paid
+# once per thread rather than once per API call
+_API_URL = urllib.parse.urlsplit(OPENAI_API_URL)
+_conn_local = threading.local()
+# Errors that mean a reused keep-alive connection was closed by the server
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# Rate-limited / overloaded responses are retried with exponential backoff,
+# honouring Retry-After when the server sends it
+API_MAX_ATTEMPTS = max(1, int(os.environ.get("HINTS_API_MAX_ATTEMPTS", "5")))
+_RETRY_STATUSES = {429, 503}
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 60.0
+
+# Each hint must open with one of these labels; highlights use one of these roles
+_HINT_LABEL_RE = re.compile(
+    r"\s*(?:indicator|fodder|definition|device|structure|surface|grammar|link|position)\s*:", re.IGNORECASE
+)
+_HIGHLIGHT_ROLE_RE = re.compile(r"indicator|fodder|definition", re.IGNORECASE)
+
+
+def json_loads(text):
+    """Parse JSON from str or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def json_dumps(data) -> str:
+    """Serialize compactly to a str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False)
 
 
 def load_json(path, default):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         return default
     except json.JSONDecodeError:
@@ -46,24 +105,86 @@ def load_json(path, default):
 
 
 def save_json(path, data):
+    """Atomically write compact JSON; the outputs are only read by the page script."""
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
     os.replace(tmp, path)
 
 
+_CACHE_SCHEMA = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, hints TEXT NOT NULL, explanation TEXT, ts INTEGER)"
+
+
+def open_cache(path, readonly: bool = False):
+    """Open the SQLite cache; entries are read and written one key at a time.
+
+    The cache is created if missing, unless readonly. A missing read-only cache,
+    or a file that isn't a usable SQLite cache (e.g. an old hints_cache.json),
+    is treated as empty: an in-memory cache is returned and the file is left alone.
+    """
+    if readonly and not os.path.exists(path):
+        return _memory_cache()
+    conn = None
+    try:
+        if readonly:
+            # immutable: read the file as-is without creating -wal/-shm files next to it
+            # (the no-key path only reads, and its directory may be deployed as-is)
+            uri = "file:" + urllib.request.pathname2url(os.path.abspath(path)) + "?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True)
+            conn.execute("SELECT 1 FROM cache LIMIT 1")
+        else:
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_CACHE_SCHEMA)
+        return conn
+    except sqlite3.DatabaseError as e:
+        if conn is not None:
+            conn.close()
+        sys.stderr.write(f"Ignoring unusable cache {path}: {e}\n")
+        return _memory_cache()
+
+
+def _memory_cache():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(_CACHE_SCHEMA)
+    return conn
+
+
+def get_cached(conn, key: str):
+    row = conn.execute("SELECT hints, explanation, ts FROM cache WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    hints, explanation, ts = row
+    return {"hints": json_loads(hints), "explanation": json_loads(explanation) if explanation else None, "ts": ts}
+
+
+def put_cached(conn, key: str, hints: list, explanation) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO cache (key, hints, explanation, ts) VALUES (?, ?, ?, ?)",
+        (
+            key,
+            json_dumps(hints),
+            json_dumps(explanation) if explanation else None,
+            int(time.time()),
+        ),
+    )
+    conn.commit()
+
+
 def cache_key(model: str, clue_text: str, answer: str) -> str:
-    h = hashlib.sha256()
     key_str = (
         f"model={model}\nprompt_version={PROMPT_VERSION}\nclue={clue_text.strip()}\nanswer={answer.strip()}"
     ).encode("utf-8")
-    h.update(key_str)
-    return h.hexdigest()
+    # "b2-" namespaces these apart from the older SHA-256 keys
+    return "b2-" + hashlib.blake2b(key_str, digest_size=16).hexdigest()
 
 
-SYSTEM_PROMPT = (
-    "You are an expert cryptic crossword setter and teacher. Provide precise, non-spoiler guidance. "
-    "Given a clue and its true answer (for validation only), craft exactly three concise hints without revealing the answer. "
+# Hint and explanation guidance is shared verbatim by the single-clue and batch prompts
+_HINT_GUIDANCE = (
     "Each hint should focus on ONE most helpful aspect. Use one of these labels at the start of each hint: "
     "'Indicator:', 'Fodder:', 'Definition:', 'Device:', 'Structure:', 'Surface:', 'Grammar:', 'Link:', 'Position:'. "
     "- Indicator: name the exact word(s) signalling the device (e.g., broken, wild, inside, back, heard). "
@@ -72,7 +193,18 @@ SYSTEM_PROMPT = (
     "- Device: state the clue type (anagram, container, hidden, reversal, homophone, deletion, insertion, initials/ends, charade, double definition, &lit). "
     "- Structure/Position/Link/Grammar/Surface: highlight helpful structure (e.g., joiners like 'with', link words, enumeration, up/down reversal cues, punctuation tricks). "
     "Always quote or clearly identify the exact clue token(s) for the chosen aspect. Do not repeat the same aspect unless strongly justified by the clue. "
-    "Keep each hint under 160 characters. Never output or spell the answer. Output strictly a JSON array of three strings, nothing else."
+    "Keep each hint under 160 characters. "
+)
+_HINT_USER_RULES = (
+    "Produce three hints. Each hint must start with exactly one label from: Indicator, Fodder, Definition, Device, Structure, Surface, Grammar, Link, Position.\n"
+    "Name the exact clue tokens for the chosen aspect. If fodder not applicable, choose a different aspect. Do not repeat aspects unless helpful.\n"
+)
+
+SYSTEM_PROMPT = (
+    "You are an expert cryptic crossword setter and teacher. Provide precise, non-spoiler guidance. "
+    "Given a clue and its true answer (for validation only), craft exactly three concise hints without revealing the answer. "
+    + _HINT_GUIDANCE
+    + "Never output or spell the answer. Output strictly a JSON array of three strings, nothing else."
 )
 
 
@@ -87,13 +219,97 @@ def build_user_prompt(clue_text: str, answer: str, length: str, direction: str =
         + "\nYou know the answer is '"
         + answer.strip()
         + "' but you must not reveal, spell, or anagram this string in any hint.\n"
-    + "Produce three hints. Each hint must start with exactly one label from: Indicator, Fodder, Definition, Device, Structure, Surface, Grammar, Link, Position.\n"
-    + "Name the exact clue tokens for the chosen aspect. If fodder not applicable, choose a different aspect. Do not repeat aspects unless helpful.\n"
+        + _HINT_USER_RULES
         + "Return only a JSON array of exactly three strings."
     )
 
 
-def openai_chat_completion(api_key: str, system_prompt: str, user_prompt: str) -> str:
+def _resolve_proxy():
+    """Return (host, port, Proxy-Authorization or None) for the proxy urllib would use, or None."""
+    proxy = urllib.request.getproxies().get(_API_URL.scheme)
+    if not proxy or urllib.request.proxy_bypass(_API_URL.hostname or ""):
+        return None
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    parts = urllib.parse.urlsplit(proxy)
+    auth = None
+    if parts.username is not None:
+        creds = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        auth = "Basic " + base64.b64encode(creds.encode("utf-8")).decode("ascii")
+    return parts.hostname, parts.port, auth
+
+
+_API_PROXY = _resolve_proxy()
+
+
+def _get_connection():
+    """Return (connection, reused) for the calling thread, opening one if needed."""
+    conn = getattr(_conn_local, "conn", None)
+    if conn is not None:
+        return conn, True
+    conn_cls = http.client.HTTPSConnection if _API_URL.scheme == "https" else http.client.HTTPConnection
+    if _API_PROXY is None:
+        conn = conn_cls(_API_URL.netloc, timeout=60)
+    else:
+        proxy_host, proxy_port, proxy_auth = _API_PROXY
+        conn = conn_cls(proxy_host, proxy_port, timeout=60)
+        if _API_URL.scheme == "https":
+            # CONNECT through the proxy; TLS is then negotiated with the API host
+            tunnel_headers = {"Proxy-Authorization": proxy_auth} if proxy_auth else None
+            conn.set_tunnel(_API_URL.hostname, _API_URL.port, headers=tunnel_headers)
+    _conn_local.conn = conn
+    return conn, False
+
+
+def _close_connection():
+    conn = getattr(_conn_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _conn_local.conn = None
+
+
+def _post(path: str, body: bytes, headers: dict):
+    """POST on this thread's connection; returns (response, body bytes)."""
+    while True:
+        conn, reused = _get_connection()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except _STALE_CONN_ERRORS as e:
+            _close_connection()
+            if reused:
+                # Server dropped an idle connection; retry once on a fresh one
+                continue
+            raise RuntimeError(f"OpenAI API network error: {e}")
+        except (http.client.HTTPException, OSError) as e:
+            _close_connection()
+            raise RuntimeError(f"OpenAI API network error: {e}")
+        if resp.will_close:
+            _close_connection()
+        return resp, raw
+
+
+def _retry_delay(retry_after, attempt: int) -> float:
+    """Seconds to wait before retry number attempt+1: Retry-After if given, else jittered backoff."""
+    backoff = _BACKOFF_BASE * 2 ** attempt
+    delay = None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            # HTTP-date form
+            try:
+                delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+    if delay is None:
+        # Full jitter so workers that were throttled together don't retry together
+        delay = random.uniform(0, backoff)
+    return min(max(delay, 0.0), _BACKOFF_MAX)
+
+
+def openai_chat_completion(api_key: str, system_prompt: str, user_prompt: str, prompt_tag: str = "") -> str:
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
@@ -108,45 +324,57 @@ def openai_chat_completion(api_key: str, system_prompt: str, user_prompt: str) -
         "temperature": 0.7,
         "n": 1,
     }
-    req = urllib.request.Request(
-        OPENAI_API_URL, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST"
-    )
-    try:
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            content = data["choices"][0]["message"]["content"].strip()
-            return content
-    except urllib.error.HTTPError as e:
-        try:
-            err = e.read().decode("utf-8")
-        except Exception:
-            err = str(e)
-        raise RuntimeError(f"OpenAI API error: {e.code} {err}")
-    except urllib.error.URLError as e:
-        raise RuntimeError(f"OpenAI API network error: {e}")
+    # The system prompts are fixed strings sent first, so every call with the same
+    # tag shares a cacheable prefix; the key keeps those calls routed together
+    if PROMPT_CACHE_KEY and prompt_tag:
+        payload["prompt_cache_key"] = f"{PROMPT_CACHE_KEY}-{prompt_tag}"
+    body = json_dumps(payload).encode("utf-8")
+    path = _API_URL.path or "/"
+    if _API_URL.query:
+        path += "?" + _API_URL.query
+    if _API_PROXY is not None and _API_URL.scheme != "https":
+        # Plain-HTTP proxies are sent the absolute URL instead of a tunnel
+        path = OPENAI_API_URL
+        if _API_PROXY[2]:
+            headers["Proxy-Authorization"] = _API_PROXY[2]
+
+    for attempt in range(API_MAX_ATTEMPTS):
+        resp, raw = _post(path, body, headers)
+        if resp.status not in _RETRY_STATUSES or attempt == API_MAX_ATTEMPTS - 1:
+            break
+        time.sleep(_retry_delay(resp.getheader("Retry-After"), attempt))
+
+    if resp.status >= 400:
+        raise RuntimeError(f"OpenAI API error: {resp.status} {raw.decode('utf-8', errors='replace')}")
+    data = json_loads(raw)
+    content = data["choices"][0]["message"]["content"].strip()
+    return content
 
 
 def validate_hints(raw_text: str, answer: str) -> list:
     """Parse JSON array, ensure 3 strings and none leak the answer."""
     try:
-        parsed = json.loads(raw_text)
+        parsed = json_loads(raw_text)
     except json.JSONDecodeError:
         # Sometimes models wrap in code fences or add text; attempt to extract JSON array
         start = raw_text.find("[")
         end = raw_text.rfind("]")
         if start != -1 and end != -1 and end > start:
             try:
-                parsed = json.loads(raw_text[start : end + 1])
+                parsed = json_loads(raw_text[start : end + 1])
             except Exception:
                 raise ValueError("Failed to parse JSON array from model output")
         else:
             raise ValueError("Model output not JSON array")
+    return check_hints(parsed, answer)
+
 
+def check_hints(parsed, answer: str) -> list:
+    """Ensure an already-parsed value is 3 labelled hint strings that don't leak the answer."""
     if not isinstance(parsed, list) or len(parsed) != 3:
         raise ValueError("Expected exactly 3 hints in a JSON array")
     out = []
     ans_lower = answer.strip().lower()
-    allowed_labels = {"indicator", "fodder", "definition", "device", "structure", "surface", "grammar", "link", "position"}
     for item in parsed:
         if not isinstance(item, str):
             raise ValueError("Hints must be strings")
@@ -156,10 +384,7 @@ def validate_hints(raw_text: str, answer: str) -> list:
         if ans_lower and ans_lower in hint.lower():
             raise ValueError("Hint leaks the answer")
         # Require a single leading label from the allowed set
-        if ":" not in hint:
-            raise ValueError("Each hint must start with a label and colon")
-        label = hint.split(":", 1)[0].strip().lower()
-        if label not in allowed_labels:
+        if not _HINT_LABEL_RE.match(hint):
             raise ValueError("Invalid or missing hint label")
         # Passed minimal validation
         out.append(hint)
@@ -176,7 +401,7 @@ def generate_hints_for_clue(api_key: str, clue: dict) -> list:
     last_err = None
     while attempts < 2:
         attempts += 1
-        raw = openai_chat_completion(api_key, SYSTEM_PROMPT, user_prompt)
+        raw = openai_chat_completion(api_key, SYSTEM_PROMPT, user_prompt, "hints")
         try:
             hints = validate_hints(raw, clue.get("answer", ""))
             return hints
@@ -191,15 +416,26 @@ def generate_hints_for_clue(api_key: str, clue: dict) -> list:
     raise RuntimeError(f"Failed to generate valid hints after retries: {last_err}")
 
 
-EXPL_SYSTEM_PROMPT = (
-    "You are an expert cryptic crossword setter and teacher. Provide a clear, numbered explanation for one clue. "
+_EXPL_GUIDANCE = (
     "Include: (1) the device name (anagram/container/hidden/reversal/homophone/deletion/insertion/initials/charade/double definition/&lit), "
     "(2) 3-6 numbered steps that cite the exact clue word(s) for each role, and (3) a highlight map. "
     "In steps, explicitly state: indicator token(s), fodder token(s) (if any), definition token(s), and any substitutions or abbreviations (e.g., 'way' => 'ST'). "
     "Each step must begin with '1.', '2.', etc. Use only clue tokens when naming parts, with brief parenthetical rationale (e.g., "
     "'Indicator: 'broken' (anagram cue)'). "
-    "Output strictly a JSON object with keys: 'device' (string), 'steps' (array of strings), and 'highlights' (array of {role:'indicator|fodder|definition', text:'exact tokens from clue'}). "
-    "Never reveal or spell the answer."
+)
+_EXPL_SCHEMA = (
+    "'device' (string), 'steps' (array of strings), and 'highlights' (array of {role:'indicator|fodder|definition', text:'exact tokens from clue'})"
+)
+_EXPL_USER_RULES = (
+    "device; steps as 3-6 numbered strings citing exact tokens plus roles (indicator/fodder/definition) and any substitutions; highlights array marking tokens by role."
+)
+
+EXPL_SYSTEM_PROMPT = (
+    "You are an expert cryptic crossword setter and teacher. Provide a clear, numbered explanation for one clue. "
+    + _EXPL_GUIDANCE
+    + "Output strictly a JSON object with keys: "
+    + _EXPL_SCHEMA
+    + ". Never reveal or spell the answer."
 )
 
 
@@ -214,21 +450,27 @@ def build_expl_user_prompt(clue_text: str, answer: str, length: str, direction:
         + "\nYou know the answer is '"
         + answer.strip()
         + "' but you must not reveal, spell, or anagram this string in any explanation.\n"
-        + "Return only JSON with: device; steps as 3-6 numbered strings citing exact tokens plus roles (indicator/fodder/definition) and any substitutions; highlights array marking tokens by role."
+        + "Return only JSON with: "
+        + _EXPL_USER_RULES
     )
 
 
 def validate_explanation(raw_text: str, answer: str) -> dict:
     try:
-        data = json.loads(raw_text)
+        data = json_loads(raw_text)
     except json.JSONDecodeError:
         # Attempt to extract object
         start = raw_text.find("{")
         end = raw_text.rfind("}")
         if start != -1 and end != -1 and end > start:
-            data = json.loads(raw_text[start : end + 1])
+            data = json_loads(raw_text[start : end + 1])
         else:
             raise ValueError("Explanation not valid JSON object")
+    return check_explanation(data, answer)
+
+
+def check_explanation(data, answer: str) -> dict:
+    """Ensure an already-parsed value is a well-formed explanation that doesn't leak the answer."""
     if not isinstance(data, dict):
         raise ValueError("Explanation must be a JSON object")
     device = data.get("device", "").strip()
@@ -242,52 +484,161 @@ def validate_explanation(raw_text: str, answer: str) -> dict:
         raise ValueError("steps must contain 1-10 items")
     if not isinstance(highlights, list):
         raise ValueError("highlights must be array")
+    ans_lower = answer.strip().lower()
     for h in highlights:
         if not isinstance(h, dict):
             raise ValueError("highlight item must be object")
-        role = str(h.get("role", "")).lower()
+        role = str(h.get("role", ""))
         text = str(h.get("text", ""))
-        if role not in {"indicator", "fodder", "definition"}:
+        if not _HIGHLIGHT_ROLE_RE.fullmatch(role):
             raise ValueError("invalid highlight role")
         # leakage check
-        if answer.strip().lower() in text.strip().lower():
+        if ans_lower and ans_lower in text.lower():
             raise ValueError("highlight leaks answer")
     # Also check steps don’t leak
-    ans_lower = answer.strip().lower()
     for s in steps:
         if ans_lower and ans_lower in s.lower():
             raise ValueError("step leaks answer")
     return {"device": device, "steps": steps, "highlights": highlights}
 
 
+def generate_explanation_for_clue(api_key: str, clue_obj: dict) -> dict:
+    """Generate an explanation with up to 2 attempts to avoid leakage and formatting issues."""
+    expl_prompt = build_expl_user_prompt(
+        clue_obj.get("clue", ""), clue_obj.get("answer", ""), clue_obj.get("length", ""), clue_obj.get("direction", "")
+    )
+    attempts = 0
+    last_err = None
+    while attempts < 2:
+        attempts += 1
+        raw_expl = openai_chat_completion(api_key, EXPL_SYSTEM_PROMPT, expl_prompt, "expl")
+        try:
+            return validate_explanation(raw_expl, clue_obj.get("answer", ""))
+        except Exception as e:
+            last_err = e
+            # tighten prompt on retry
+            expl_prompt = (
+                expl_prompt
+                + "\nIMPORTANT: Do NOT reveal or spell the answer in any step or highlight. Use only clue tokens; keep steps generic. Return ONLY JSON object."
+            )
+            time.sleep(0.5)
+    raise RuntimeError(f"Failed to generate valid explanation after retries: {last_err}")
+
+
+BATCH_SYSTEM_PROMPT = (
+    "You are an expert cryptic crossword setter and teacher. Provide precise, non-spoiler guidance. "
+    "You will receive several clues, each tagged with an id in square brackets and given with its true answer (for validation only). "
+    "For every clue produce 'hints' and an 'explanation'. "
+    "'hints': exactly three concise hints without revealing the answer. "
+    + _HINT_GUIDANCE
+    + "'explanation': a clear, numbered explanation of the clue. "
+    + _EXPL_GUIDANCE
+    + "Each explanation is a JSON object with keys: "
+    + _EXPL_SCHEMA
+    + ". Never output, spell, or anagram any answer, including in the hints or explanation of a different clue. "
+    "Output strictly a JSON array with one object per clue: {\"id\": \"<id>\", \"hints\": [...], \"explanation\": {...}}, nothing else."
+)
+
+
+def build_batch_user_prompt(clues: list) -> str:
+    parts = []
+    for clue in clues:
+        direction = clue.get("direction", "")
+        dir_line = f"\nDirection: {direction}" if direction else ""
+        parts.append(
+            f"[{clue.get('word_id')}] Clue: "
+            + clue.get("clue", "").strip()
+            + dir_line
+            + "\nAnswer length: "
+            + str(clue.get("length", ""))
+            + "\nAnswer (do not reveal): "
+            + clue.get("answer", "").strip()
+        )
+    return (
+        "\n\n".join(parts)
+        + "\n\nFor each clue's hints: "
+        + _HINT_USER_RULES
+        + "For each clue's explanation: "
+        + _EXPL_USER_RULES
+        + f"\nReturn only a JSON array of {len(clues)} objects, one per id above, each with id, hints and explanation."
+    )
+
+
+def generate_batch_for_clues(api_key: str, clues: list) -> dict:
+    """Generate hints and explanations for several clues in one request.
+
+    Returns {word_id: (hints, explanation)} for the items that passed validation;
+    clues missing from the result should be retried individually.
+    """
+    raw = openai_chat_completion(api_key, BATCH_SYSTEM_PROMPT, build_batch_user_prompt(clues), "batch")
+    try:
+        parsed = json_loads(raw)
+    except json.JSONDecodeError:
+        start = raw.find("[")
+        end = raw.rfind("]")
+        if start != -1 and end != -1 and end > start:
+            parsed = json_loads(raw[start : end + 1])
+        else:
+            raise ValueError("Batch output not JSON array")
+    if not isinstance(parsed, list):
+        raise ValueError("Batch output must be a JSON array")
+
+    by_id = {str(clue.get("word_id")): clue for clue in clues}
+    # Every answer in the batch is in the prompt, so each item is checked
+    # against all of them, not just its own
+    answers = [clue.get("answer", "") for clue in clues]
+    out = {}
+    for item in parsed:
+        if not isinstance(item, dict):
+            continue
+        wid = str(item.get("id", ""))
+        clue = by_id.get(wid)
+        if clue is None:
+            continue
+        try:
+            for answer in answers:
+                hints = check_hints(item.get("hints"), answer)
+                explanation = check_explanation(item.get("explanation"), answer)
+        except (ValueError, AttributeError):
+            continue
+        out[wid] = (hints, explanation)
+    return out
+
+
 def main():
-    if len(sys.argv) not in (3, 4):
-        print("Usage: python scripts/generate_hints.py <game_data.json> <hints.json> [explanations.json]")
+    args = sys.argv[1:]
+    backfill = BACKFILL_EXPL or "--backfill" in args
+    args = [a for a in args if a != "--backfill"]
+    if len(args) not in (2, 3):
+        print("Usage: python scripts/generate_hints.py [--backfill] <game_data.json> <hints.json> [explanations.json]")
         sys.exit(1)
 
-    game_data_path = sys.argv[1]
-    hints_out_path = sys.argv[2]
-    expl_out_path = sys.argv[3] if len(sys.argv) == 4 else "explanations.json"
+    game_data_path = args[0]
+    hints_out_path = args[1]
+    expl_out_path = args[2] if len(args) == 3 else "explanations.json"
+
+    game_data = load_json(game_data_path, {})
+    clues = game_data.get("clues", [])
+    # Annotate each clue with its cache key once; everything below reads clue["_key"]
+    for clue in clues:
+        clue["_key"] = cache_key(MODEL, clue.get("clue", ""), clue.get("answer", ""))
 
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         # No API key; try to reconstruct outputs from cache to avoid empty site
-        game_data = load_json(game_data_path, {})
-        clues = game_data.get("clues", [])
-        cache = load_json(CACHE_FILE, {})
+        cache = open_cache(CACHE_FILE, readonly=True)
         hints_result = {}
         expl_result = {}
         for clue in clues:
             word_id = str(clue.get("word_id"))
             if not word_id:
                 continue
-            key = cache_key(MODEL, clue.get("clue", ""), clue.get("answer", ""))
-            if key in cache:
-                entry = cache[key]
-                if "hints" in entry:
-                    hints_result[word_id] = entry["hints"]
-                if "explanation" in entry and entry["explanation"]:
+            entry = get_cached(cache, clue["_key"])
+            if entry is not None:
+                hints_result[word_id] = entry["hints"]
+                if entry["explanation"]:
                     expl_result[word_id] = entry["explanation"]
+        cache.close()
 
         # Only write files if we have some data, or the targets don't exist yet
         def maybe_write(path, data):
@@ -308,104 +659,84 @@ def main():
         )
         return
 
-    game_data = load_json(game_data_path, {})
-    clues = game_data.get("clues", [])
     if not clues:
         save_json(hints_out_path, {})
         print("No clues found; generated empty hints.json")
         return
 
-    cache = load_json(CACHE_FILE, {})
+    cache = open_cache(CACHE_FILE)
     hints_result = {}
     expl_result = {}
 
-    # Prepare work lists
-    # - work_full: no cache entry; generate both hints and explanation
-    # - work_expl_only: cache has hints but no explanation; generate explanation only
-    work_full = []
-    work_expl_only = []
+    # One work item per clue that still needs generating. Cached hints are
+    # passed along so only the missing explanation is requested (backfill
+    # runs only); hints=None means nothing is cached and both are generated.
+    work = []
     for clue in clues:
         word_id = str(clue.get("word_id"))
         if not word_id:
             continue
-        key = cache_key(MODEL, clue.get("clue", ""), clue.get("answer", ""))
-        if key in cache:
+        cached_entry = get_cached(cache, clue["_key"])
+        if cached_entry is not None:
             # Reuse cached hints
-            cached_entry = cache[key]
-            hints_result[word_id] = cached_entry.get("hints", [])
-            if "explanation" in cached_entry and cached_entry["explanation"]:
+            hints_result[word_id] = cached_entry["hints"]
+            if cached_entry["explanation"]:
                 expl_result[word_id] = cached_entry["explanation"]
-            else:
-                # Need to generate explanation only
-                work_expl_only.append((word_id, key, clue))
+            elif backfill:
+                work.append((word_id, clue, hints_result[word_id]))
         else:
-            work_full.append((word_id, key, clue))
-
-    def generate_explanation_for_clue(api_key: str, clue_obj: dict) -> dict:
-        """Generate an explanation with up to 2 attempts to avoid leakage and formatting issues."""
-        expl_prompt = build_expl_user_prompt(
-            clue_obj.get("clue", ""), clue_obj.get("answer", ""), clue_obj.get("length", ""), clue_obj.get("direction", "")
-        )
-        attempts = 0
-        last_err = None
-        while attempts < 2:
-            attempts += 1
-            raw_expl = openai_chat_completion(api_key, EXPL_SYSTEM_PROMPT, expl_prompt)
-            try:
-                return validate_explanation(raw_expl, clue_obj.get("answer", ""))
-            except Exception as e:
-                last_err = e
-                # tighten prompt on retry
-                expl_prompt = (
-                    expl_prompt
-                    + "\nIMPORTANT: Do NOT reveal or spell the answer in any step or highlight. Use only clue tokens; keep steps generic. Return ONLY JSON object."
-                )
-                time.sleep(0.5)
-        raise RuntimeError(f"Failed to generate valid explanation after retries: {last_err}")
+            work.append((word_id, clue, None))
 
     def task(item):
-        wid, key, clue_obj = item
-        hints = generate_hints_for_clue(api_key, clue_obj)
-        explanation = generate_explanation_for_clue(api_key, clue_obj)
-        return wid, key, hints, explanation
-
-    def task_expl_only(item):
-        wid, key, clue_obj = item
+        wid, clue_obj, hints = item
+        if hints is None:
+            hints = generate_hints_for_clue(api_key, clue_obj)
         explanation = generate_explanation_for_clue(api_key, clue_obj)
-        return wid, key, explanation
-
-    # Execute work in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-        futures = []
-        if work_full:
-            futures.extend([ex.submit(task, it) for it in work_full])
-        if work_expl_only:
-            futures.extend([ex.submit(task_expl_only, it) for it in work_expl_only])
+        return wid, clue_obj["_key"], hints, explanation
 
-        for fut in concurrent.futures.as_completed(futures):
+    def task_batch(batch):
+        generated = {}
+        if len(batch) > 1:
             try:
-                result = fut.result()
-                # Discriminate by tuple size
-                if len(result) == 4:
-                    wid, key, hints, explanation = result
-                    hints_result[wid] = hints
-                    expl_result[wid] = explanation
-                    cache[key] = {"hints": hints, "explanation": explanation, "ts": int(time.time())}
-                else:
-                    wid, key, explanation = result
-                    # Keep existing hints_result[wid]
-                    expl_result[wid] = explanation
-                    cache_entry = cache.get(key, {})
-                    cache[key] = {"hints": cache_entry.get("hints", hints_result.get(wid, [])), "explanation": explanation, "ts": int(time.time())}
+                generated = generate_batch_for_clues(api_key, [clue_obj for _, clue_obj, _ in batch])
+            except Exception as e:
+                sys.stderr.write(f"Batch generation failed; retrying its clues individually: {e}\n")
+        results = []
+        for item in batch:
+            wid, clue_obj, _ = item
+            if wid in generated:
+                hints, explanation = generated[wid]
+                results.append((wid, clue_obj["_key"], hints, explanation))
+                continue
+            # Not batched, or the batch item failed validation: single-clue path
+            try:
+                results.append(task(item))
             except Exception as e:
                 # On failure, skip this clue
                 sys.stderr.write(f"Generation failed for a clue: {e}\n")
+        return results
+
+    # Clues with nothing cached are batched; explanation-only work stays single
+    misses = [it for it in work if it[2] is None]
+    batches = [misses[i : i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+    batches.extend([it] for it in work if it[2] is not None)
+
+    # Execute work in parallel
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = [ex.submit(task_batch, batch) for batch in batches]
+        for fut in concurrent.futures.as_completed(futures):
+            for wid, key, hints, explanation in fut.result():
+                hints_result[wid] = hints
+                expl_result[wid] = explanation
+                # Cache entries are written as they arrive, so a failed run keeps its progress
+                put_cached(cache, key, hints, explanation)
 
     # Persist outputs
     save_json(hints_out_path, hints_result)
     save_json(expl_out_path, expl_result)
-    save_json(CACHE_FILE, cache)
-    print(f"Generated hints/explanations for {len(hints_result)} clues; cached: {len(cache)} entries")
+    (cached_count,) = cache.execute("SELECT COUNT(*) FROM cache").fetchone()
+    cache.close()
+    print(f"Generated hints/explanations for {len(hints_result)} clues; cached: {cached_count} entries")
 
 
 if __name__ == "__main__":
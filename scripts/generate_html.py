@@ -2,19 +2,38 @@
 import json
 import sys
 
+# Grid cell fields read by the page script; anything else (e.g. Letter) is dropped
+CELL_FIELDS = ('SquareID', 'Number', 'Blank', 'WordAcrossID', 'WordDownID')
+
+def slim_grid(grid):
+    # Empty values are omitted too: the page only truth-tests or compares these
+    # fields, where a missing key behaves the same as ''
+    return [[{k: cell[k] for k in CELL_FIELDS if cell.get(k)} for cell in row] for row in grid]
+
 def generate_html(template_file, data_file, output_file):
     with open(template_file, 'r') as f:
         template = f.read()
     
     with open(data_file, 'r') as f:
         data = json.load(f)
+    data = dict(data, grid=slim_grid(data['grid']))
     
-    # Replace placeholders
-    html = template.replace('{{TITLE}}', data['title'])
-    html = html.replace('{{GAME_DATA}}', json.dumps(data))
+    # Replace placeholders; game data is streamed between the template halves
+    # rather than built as one large string and spliced in. Splitting first
+    # means text inside the title or data is never scanned for placeholders.
+    pre, _, post = template.partition('{{GAME_DATA}}')
+    pre = pre.replace('{{TITLE}}', data['title'])
+    post = post.replace('{{TITLE}}', data['title'])
     
-    with open(output_file, 'w') as f:
-        f.write(html)
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(pre)
+        for chunk in encoder.iterencode(data):
+            # '<' only occurs inside JSON strings; writing every one as \u003c
+            # means clue text can't close the surrounding <script> or open a
+            # '<!--' / '<script' sequence that changes how it is parsed
+            f.write(chunk.replace('<', '\\u003c'))
+        f.write(post)
 
 if __name__ == '__main__':
     if len(sys.argv) != 4: